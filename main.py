@@ -2,6 +2,8 @@ import argparse
 import sys
 import os
 import logging
+import logging.handlers
+import queue
 import asyncio
 import signal
 from typing import Optional
@@ -35,8 +37,16 @@ class AFCToDebugFilter(logging.Filter):
 # --- Setup Logging ---
 LOG_FILE = "valh.log"
 
+# Writes queued log records to the file/console handlers off the event loop
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
 def setup_logging():
-    """Configure logging for the application"""
+    """Configure logging for the application.
+
+    The root logger only enqueues records; a QueueListener thread does the
+    formatting and the file/console writes, so logging never blocks the loop.
+    """
+    global _log_listener
     logging.root.handlers.clear()
     
     logger = logging.getLogger()
@@ -54,12 +64,17 @@ def setup_logging():
     file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
     file_handler.setFormatter(formatter)
     file_handler.addFilter(AFCToDebugFilter())
-    logger.addHandler(file_handler)
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.addFilter(AFCToDebugFilter())
-    logger.addHandler(console_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
 
     return logger
 
@@ -321,6 +336,14 @@ def main():
     # Windows specific event loop policy
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        # libuv-backed loop for the network-bound bot traffic, when installed
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            pass
     
     try:
         logger.info("=" * 60)
@@ -338,6 +361,9 @@ def main():
         sys.exit(1)
     finally:
         logger.info("Application terminated")
+        # Flush whatever is still queued before the interpreter exits
+        if _log_listener is not None:
+            _log_listener.stop()
 
 
 if __name__ == "__main__":
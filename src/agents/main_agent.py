@@ -1,7 +1,8 @@
 import asyncio
 import logging
 import uuid
-from typing import Dict, Any
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Any
 
 from agents.agent_id import AGENT_ID
 from app.app_context import get_app_context
@@ -10,17 +11,30 @@ from infrastructure.command_bus import CommandBus
 from engine.core.agent import Agent
 from engine.registry.tool_registry import ToolRegistry
 from engine.registry.tool_discovery import ToolDiscovery
-from services.notification_service import get_notification_service
+from src.services.notification_service import get_notification_service
 import telegram
 from infrastructure.command_bus import CommandBus
 from infrastructure.websocket_manager import get_websocket_manager
 from domain.event import Event, EventType
-from services.telegram_bot.config import ADMIN_USER_IDS
+from src.services.telegram_bot.config import ADMIN_USER_IDS
 
 from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Chat sessions kept alive; the least recently used one is dropped beyond this
+MAX_AGENT_SESSIONS = 1000
+
+# Minimum seconds between streamed Telegram frames; chunks arriving in between
+# are only appended and show up in the next frame (the bot edits at most 1/s)
+STREAM_FRAME_INTERVAL = 0.25
+# Streamed replies longer than this continue in a new Telegram message, so each
+# edit resends at most one message's worth of text instead of the whole reply
+STREAM_MESSAGE_LIMIT = 3500
+
+# Agent turns streamed at once across all chats; further turns wait for a slot
+MAX_CONCURRENT_AGENTS = 32
+
 class MainAgent(BaseAgent):
     """
     MainAgent is the SINGLE async orchestrator.
@@ -45,7 +59,13 @@ class MainAgent(BaseAgent):
         self.running = True
         self.ws_manager = get_websocket_manager()
         self.agent_manager = get_agent_manager()
-        self._agents: Dict[int, Agent] = {}
+        # Chat ids with an agent session, in LRU order (least recently used first).
+        # The agent itself is looked up in the manager, which replaces it on
+        # model or config switches.
+        self._sessions: "OrderedDict[int, None]" = OrderedDict()
+        # Turns waiting per chat; present only while that chat's worker runs
+        self._chat_turns: Dict[int, Deque[Event]] = {}
+        self._agent_slots = asyncio.Semaphore(MAX_CONCURRENT_AGENTS)
 
     def _get_registry(self) -> ToolRegistry:
         """
@@ -67,10 +87,12 @@ class MainAgent(BaseAgent):
         return registry
 
     def _get_or_create_agent(self, chat_id: int) -> Agent:
-        if chat_id not in self._agents:
-            session_agent_id = f"main_agent_{chat_id}"
-            
-            self._agents[chat_id] = self.create(
+        session_agent_id = f"main_agent_{chat_id}"
+        agent = self.agent_manager.get_agent(session_agent_id)
+        if chat_id in self._sessions and agent is not None:
+            self._sessions.move_to_end(chat_id)
+        else:
+            agent = self.create(
                 system_prompt_file=[
                     "identity.md",
                     "system.md",
@@ -82,24 +104,70 @@ class MainAgent(BaseAgent):
                 agent_id=session_agent_id,
                 set_as_current=True 
             )
-            logger.info(f"✨ Created new agent session: {session_agent_id}")
-            
-        return self.agent_manager.get_agent()
+            self._sessions[chat_id] = None
+            self._sessions.move_to_end(chat_id)
+            logger.info("✨ Created new agent session: %s", session_agent_id)
+
+            if len(self._sessions) > MAX_AGENT_SESSIONS:
+                # Abandoned chats would otherwise keep their agent and memory forever
+                evicted_chat_id, _ = self._sessions.popitem(last=False)
+                self.agent_manager.remove_agent(f"main_agent_{evicted_chat_id}")
+
+        return agent
 
     async def run(self):
         logger.info("🧠 MainAgent orchestrator loop started")
         while self.running:
             try:
                 event: Event = await self.command_bus.receive()
-                if event.type == EventType.USER_MESSAGE:
-                    asyncio.create_task(self._handle_user_message(event))
-                elif event.type == EventType.USER_APPROVAL:
-                    asyncio.create_task(self._handle_user_approval(event))
+                if event.type in (EventType.USER_MESSAGE, EventType.USER_APPROVAL):
+                    self._enqueue_turn(event)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in MainAgent loop: {e}", exc_info=True)
 
+    def _enqueue_turn(self, event: Event):
+        """
+        Queue a chat's turn behind any turn it already has running.
+        Different chats still run concurrently, and nothing holds a lock
+        while the agent streams.
+        """
+        chat_id = event.payload["chat_id"]
+        turns = self._chat_turns.get(chat_id)
+        if turns is None:
+            turns = self._chat_turns[chat_id] = deque()
+            asyncio.create_task(self._run_chat_turns(chat_id, turns))
+        turns.append(event)
+
+    async def _run_chat_turns(self, chat_id: int, turns: Deque[Event]):
+        """Handle one chat's queued turns in order, exiting once none are left."""
+        try:
+            while turns:
+                event = turns.popleft()
+                try:
+                    await self._run_turn(chat_id, event)
+                except Exception:
+                    # One failed turn must not drop the chat's remaining turns
+                    logger.exception("Turn %s for chat %s failed", event.id, chat_id)
+        finally:
+            del self._chat_turns[chat_id]
+
+    async def _run_turn(self, chat_id: int, event: Event):
+        """Run one turn once an agent slot is free, telling Telegram chats if they wait."""
+        queued = self._agent_slots.locked() and event.source == "telegram"
+        if queued:
+            await self.bot.send_or_edit(chat_id=chat_id, text="⏳ Queued, waiting for a free agent...")
+        # A slot is held per turn, so busy chats cannot starve the others
+        async with self._agent_slots:
+            if queued:
+                # The queued notice ended the typing indicator
+                self.bot.show_typing(chat_id)
+            if event.type == EventType.USER_MESSAGE:
+                await self._handle_user_message(event)
+            else:
+                await self._handle_user_approval(event)
+
     async def _handle_user_message(self, event: Event):
         chat_id = event.payload["chat_id"]
         text = event.payload["text"]
@@ -110,6 +178,11 @@ class MainAgent(BaseAgent):
             agent = self._get_or_create_agent(chat_id)
             full_response_text = ""
             current_status = "🤔 Thinking..."
+            loop = asyncio.get_running_loop()
+            next_frame_at = 0.0
+            # Offset of the current Telegram message within the reply
+            message_start = 0
+            prefer_edit = True
             
             async for chunk in agent.stream(text):
                 if chunk.content:
@@ -125,10 +198,19 @@ class MainAgent(BaseAgent):
                             }
                         })
                     else:
-                        await self.bot.send_or_edit(
-                            chat_id=chat_id, 
-                            text=f"{full_response_text}\n\n{current_status}"
-                        )
+                        if len(full_response_text) - message_start > STREAM_MESSAGE_LIMIT:
+                            message_start = await self._close_full_messages(
+                                chat_id, full_response_text, message_start, prefer_edit
+                            )
+                            prefer_edit, next_frame_at = False, 0.0
+                        if loop.time() >= next_frame_at:
+                            next_frame_at = loop.time() + STREAM_FRAME_INTERVAL
+                            await self.bot.send_or_edit(
+                                chat_id=chat_id, 
+                                text=f"{full_response_text[message_start:]}\n\n{current_status}",
+                                prefer_edit=prefer_edit
+                            )
+                            prefer_edit = True
                 
                 if chunk.tool_call:
                     tool_name = chunk.tool_call.name
@@ -136,15 +218,22 @@ class MainAgent(BaseAgent):
                     if source != "web_ui":
                         await self.bot.send_or_edit(
                             chat_id=chat_id, 
-                            text=f"{full_response_text}\n\n{current_status}"
+                            text=f"{full_response_text[message_start:]}\n\n{current_status}",
+                            prefer_edit=prefer_edit
                         )
+                        prefer_edit = True
                     await self.ws_manager.broadcast_status("tool_use", details=tool_name)
 
                 if chunk.tool_result:
                     current_status = "🤔 Thinking..."
 
             if source == "telegram":
-                 await self.bot.send_or_edit(chat_id=chat_id, text=full_response_text + "\n ✔️", is_final=True)
+                 await self.bot.send_or_edit(
+                     chat_id=chat_id,
+                     text=full_response_text[message_start:] + "\n ✔️",
+                     is_final=True,
+                     prefer_edit=prefer_edit
+                 )
             elif source == "web_ui":
                  # Final signal
                  await self.ws_manager.broadcast({
@@ -159,7 +248,7 @@ class MainAgent(BaseAgent):
                  await self.notification_service.send_custom_notification(full_response_text)
 
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
             if source == "web_ui":
                  await self.ws_manager.broadcast({"type": "error", "message": str(e)})
             else:
@@ -167,6 +256,23 @@ class MainAgent(BaseAgent):
         finally:
             await self.ws_manager.broadcast_status("idle")
 
+    async def _close_full_messages(self, chat_id: int, text: str, start: int, prefer_edit: bool) -> int:
+        """Finalize the current message while the reply overflows it.
+
+        Each finished part is cut at a line break where possible. Returns the
+        offset where the next (not yet sent) message begins.
+        """
+        while len(text) - start > STREAM_MESSAGE_LIMIT:
+            end = start + STREAM_MESSAGE_LIMIT
+            cut = text.rfind("\n", start + STREAM_MESSAGE_LIMIT // 2, end)
+            if cut == -1:
+                cut = end
+            await self.bot.send_or_edit(
+                chat_id=chat_id, text=text[start:cut], is_final=True, prefer_edit=prefer_edit
+            )
+            start, prefer_edit = cut, False
+        return start
+
     async def _handle_user_approval(self, event: Event):
         chat_id = event.payload["chat_id"]
         approved = event.payload["approved"]
@@ -184,7 +290,7 @@ class MainAgent(BaseAgent):
 
             await self.bot.send_or_edit(chat_id=chat_id, text=full_response_text, is_final=True)
         except Exception as e:
-             logger.error(f"Error handling approval: {e}")
+             logger.error("Error handling approval: %s", e)
         finally:
              await self.ws_manager.broadcast_status("idle")
 
@@ -66,22 +66,22 @@ async def run_console_chat():
             try:
                 async for chunk in me.stream(user_input):
                     # Handle Tool Calls
-                    if hasattr(chunk, 'tool_call') and chunk.tool_call:
+                    if chunk.tool_call:
                         args = str(chunk.tool_call.arguments)
                         if len(args) > 100: args = args[:100] + "..."
                         print(f"\n[⚙️ Calling: {chunk.tool_call.name}({args})]", end="", flush=True)
                     
                     # Handle Tool Results
-                    elif hasattr(chunk, 'tool_result') and chunk.tool_result:
+                    elif chunk.tool_result:
                         res = str(chunk.tool_result.result)
                         print(f" -> [✅ Result: {res[:100]}...]\n", flush=True)
                     
                     # Handle Text Content
-                    elif hasattr(chunk, 'content') and chunk.content:
+                    elif chunk.content:
                         print(chunk.content, end="", flush=True)
                     
                     # Handle Permission Requests (HITL)
-                    elif hasattr(chunk, 'permission_request') and chunk.permission_request:
+                    elif chunk.permission_request:
                         names = ", ".join([t.name for t in chunk.permission_request])
                         print(f"\n\n⚠️  PERMISSION REQUIRED: I need to run: {names}")
                         decision = await asyncio.get_event_loop().run_in_executor(None, input, "Type 'yes' to approve: ")
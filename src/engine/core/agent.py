@@ -253,11 +253,11 @@ class Agent:
             yield StreamChunk(content="\n\nMax steps reached without final answer.")
             raise MaxStepsExceededError(f"Max steps ({self.max_steps}) reached without final answer.")
         except AgentError as e:
-            logger.error(f"Agent Error: {e}")
+            logger.error("Agent Error: %s", e)
             yield StreamChunk(content=f"\n\n❌ {str(e)}")
             raise
         except Exception as e:
-            logger.error(f"Unexpected Agent Error: {e}")
+            logger.error("Unexpected Agent Error: %s", e)
             yield StreamChunk(content=f'\n\n❌ Encountered Error: {e}')
             raise AgentError(str(e)) from e
         
\ No newline at end of file
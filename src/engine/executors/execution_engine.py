@@ -42,10 +42,10 @@ class ExecutionEngine:
         """
         Execute a single tool call safely, supporting both sync and async tools.
         """
-        logger.info(f"⚡ ExecutionEngine: About to execute {call.name}")
+        logger.info("⚡ ExecutionEngine: About to execute %s", call.name)
         
         if self.event_bus:
-            logger.info(f"⚡ ExecutionEngine: Publishing START event for {call.name}")
+            logger.info("⚡ ExecutionEngine: Publishing START event for %s", call.name)
             try:
                 self.event_bus.publish(Event(
                     type=EventType.TOOL_EXECUTION_STARTED,
@@ -57,7 +57,7 @@ class ExecutionEngine:
                     }
                 ))
             except Exception as e:
-                logger.error(f"⚡ ExecutionEngine: Failed to publish START event: {e}")
+                logger.error("⚡ ExecutionEngine: Failed to publish START event: %s", e)
         else:
             logger.error("⚡ ExecutionEngine: EventBus is None!")
 
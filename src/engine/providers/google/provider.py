@@ -120,8 +120,7 @@ class GoogleProvider(BaseProvider):
         return type_mapping.get(json_type, genai_types.Type.STRING)
     
     def _get_config(self, tools: List[BaseTool]) -> genai_types.GenerateContentConfig :
-        print(f"----------{self.config.get(
-                "additional_params", {}).get("include_thoughts")}----------")
+        logger.debug("include_thoughts=%s", self.config.get("additional_params", {}).get("include_thoughts"))
         if tools:
             function_declarations = self._create_function_declarations(tools)
             tool = genai_types.Tool(function_declarations=function_declarations)
@@ -188,7 +187,7 @@ class GoogleProvider(BaseProvider):
         retry_delay = 1.5
         for attempt in range(max_retries):
             try:
-                print(f"------------{self.model_id}--------------")
+                logger.debug("Streaming from %s", self.model_id)
                 response_iterator = self.client.models.generate_content_stream(
                     model=self.model_id,
                     contents=contents,
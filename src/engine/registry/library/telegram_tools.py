@@ -2,7 +2,7 @@ import requests
 from typing import Any, Optional
 from pydantic import Field
 from engine.registry.base_tool import BaseTool
-from services.telegram_bot.config import TELEGRAM_BOT_TOKEN, AUTHORIZED_USERS
+from src.services.telegram_bot.config import TELEGRAM_BOT_TOKEN, PRIMARY_USER_ID
 
 class SendTelegramMessageTool(BaseTool):
     """
@@ -22,8 +22,8 @@ class SendTelegramMessageTool(BaseTool):
 
         # Default to first authorized user if no specific chat_id is given
         if not chat_id:
-            if AUTHORIZED_USERS:
-                chat_id = AUTHORIZED_USERS[0]
+            if PRIMARY_USER_ID is not None:
+                chat_id = PRIMARY_USER_ID
             else:
                 return {"status": "error", "error": "No chat_id provided and no authorized users found to default to."}
 
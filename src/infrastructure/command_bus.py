@@ -23,5 +23,9 @@ class CommandBus:
         # print(f"Event: {event.type}") # Optional logging
         await self._queue.put(event)
 
+    def send_nowait(self, event: Event):
+        # The queue is unbounded, so this never blocks the caller
+        self._queue.put_nowait(event)
+
     async def receive(self) -> Event:
         return await self._queue.get()
\ No newline at end of file
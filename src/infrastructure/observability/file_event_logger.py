@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 from datetime import datetime
@@ -31,11 +30,10 @@ class FileEventLogger:
         Handler that writes the event to the file.
         """
         try:
-            # Convert to dict and handle datetime serialization
-            event_dict = event.model_dump()
-            event_dict['timestamp'] = event.timestamp.isoformat()
-            
+            # pydantic's compiled serializer handles the datetime and enum fields
+            line = event.model_dump_json()
+
             with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event_dict) + "\n")
+                f.write(line + "\n")
         except Exception as e:
             logger.error(f"Failed to log event to file: {e}")
@@ -49,9 +49,9 @@ class CronService:
         logger.info(f"📅 Scheduled Cron Job: {name} (every {interval_seconds}s)")
 
     def stop_job(self, name: str):
-        if name in self.jobs:
-            self.jobs[name].task.cancel()
-            del self.jobs[name]
+        job = self.jobs.pop(name, None)
+        if job:
+            job.task.cancel()
             logger.info(f"🛑 Stopped Cron Job: {name}")
 
     def list_jobs(self):
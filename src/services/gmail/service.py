@@ -3,32 +3,56 @@
 import base64
 import os
 import mimetypes
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+from google.auth.exceptions import GoogleAuthError
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from src.services.gmail.auth import get_gmail_credentials
 
+# Built services, one per thread: the tools run in executor threads and the
+# httplib2 transport underneath a service is not thread-safe
+_local = threading.local()
+
 
 def get_gmail_service():
     """
     Returns an authenticated Gmail API service object.
+
+    The service is cached per thread, so credentials are loaded and the client
+    built once rather than on every tool call; the credentials refresh their
+    own access token when it expires. An auth error drops the cached service.
     """
+    service = getattr(_local, "service", None)
+    if service is not None:
+        return service
+
     creds = get_gmail_credentials()
     if not creds:
         print("Error: Could not obtain Gmail credentials.")
         return None
     try:
         service = build('gmail', 'v1', credentials=creds)
+        _local.service = service
         return service
     except Exception as e:
         print(f"Error building Gmail service: {e}")
         return None
 
 
+def _drop_service_on_auth_error(error: Exception):
+    """
+    Forgets this thread's cached service when the error means its credentials
+    no longer work (failed refresh, revoked access), so the next call rebuilds it.
+    """
+    if isinstance(error, GoogleAuthError) or (isinstance(error, HttpError) and error.resp.status == 401):
+        _local.service = None
+
+
 def search_emails(service, query: str, limit: int = 5):
     """
     Searches for emails based on a query and returns a list of simplified objects.
@@ -65,11 +89,13 @@ def search_emails(service, query: str, limit: int = 5):
                     'snippet': snippet
                 })
             except Exception as e:
+                _drop_service_on_auth_error(e)
                 print(f"Error fetching detail for message {msg['id']}: {e}")
                 continue
             
         return results
-    except HttpError as error:
+    except (HttpError, GoogleAuthError) as error:
+        _drop_service_on_auth_error(error)
         print(f'An error occurred: {error}')
         return []
 
@@ -145,6 +171,7 @@ def get_email_details(service, msg_id: str):
         }
 
     except Exception as e:
+        _drop_service_on_auth_error(e)
         print(f"Error parsing email details for {msg_id}: {e}")
         return None
 
@@ -160,6 +187,7 @@ def download_attachment(service, message_id, attachment_id):
         file_data = base64.urlsafe_b64decode(attachment['data'])
         return file_data
     except Exception as e:
+        _drop_service_on_auth_error(e)
         print(f"Error downloading attachment: {e}")
         return None
 
@@ -212,6 +240,7 @@ def send_email(service, to: str, subject: str, message_text: str, attachments: l
         
         sent_message = service.users().messages().send(userId="me", body=body).execute()
         return sent_message
-    except HttpError as error:
+    except (HttpError, GoogleAuthError) as error:
+        _drop_service_on_auth_error(error)
         print(f'An error occurred: {error}')
         return None
@@ -60,8 +60,7 @@ class ModelPreferences:
         self._save()
 
     def delete_preference(self, agent_id: str):
-        if agent_id in self._preferences:
-            del self._preferences[agent_id]
+        if self._preferences.pop(agent_id, None) is not None:
             self._save()
 
 # Global Instance
@@ -3,12 +3,19 @@ import asyncio
 from threading import Lock
 from typing import Any, Dict, Optional, List
 
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
 from app.app_context import get_app_context
 
 from src.domain.event import Event, EventType
 from src.domain.task import Task
 from src.services.telegram_bot.config import ADMIN_USER_IDS
 
+# Plain notifications raised within this many seconds go out as one message
+NOTIFY_BATCH_WINDOW = 0.5
+# Telegram caps messages at 4096 characters; leave headroom for HTML entities
+MAX_BATCH_LENGTH = 4000
+
 class NotificationService:
     _instance: Optional["NotificationService"] = None
     _lock = Lock()
@@ -24,6 +31,10 @@ class NotificationService:
         if not hasattr(self, "_initialized"):
             self._initialized = True
             self._application = None
+            # Plain notifications waiting for the batch window to close
+            self._outbox: List[str] = []
+            self._outbox_timer: Optional[asyncio.TimerHandle] = None
+            self._outbox_task: Optional[asyncio.Task] = None
             self._publisher = get_app_context().event_bus
             self._subscribe_to_events()
 
@@ -39,6 +50,50 @@ class NotificationService:
         self._publisher.subscribe(EventType.TASK_COMPLETED, self._handle_task_completed)
 
     async def _send_message_to_admins(self, message: str, reply_markup=None) -> None:
+        """Queues a message for all configured admin user IDs.
+
+        Plain messages are batched for NOTIFY_BATCH_WINDOW so a burst of task
+        events costs one send per admin. Messages with buttons cannot be merged;
+        they go out right away, after anything already queued.
+        """
+        if reply_markup is None:
+            self._outbox.append(message)
+            if self._outbox_timer is None:
+                loop = asyncio.get_running_loop()
+                self._outbox_timer = loop.call_later(NOTIFY_BATCH_WINDOW, self._flush_outbox)
+            return
+
+        if self._outbox_timer is not None:
+            self._outbox_timer.cancel()
+            self._flush_outbox()
+        if self._outbox_task is not None:
+            await asyncio.gather(self._outbox_task, return_exceptions=True)
+        await self._deliver(message, reply_markup)
+
+    def _flush_outbox(self) -> None:
+        """Send everything queued so far as few messages as MAX_BATCH_LENGTH allows."""
+        self._outbox_timer = None
+        messages, self._outbox = self._outbox, []
+        batches: List[List[str]] = []
+        length = 0
+        for message in messages:
+            if batches and length + 2 + len(message) <= MAX_BATCH_LENGTH:
+                batches[-1].append(message)
+                length += 2 + len(message)
+            else:
+                batches.append([message])
+                length = len(message)
+        batches = ["\n\n".join(batch) for batch in batches]
+        self._outbox_task = asyncio.create_task(self._deliver_batches(batches, self._outbox_task))
+
+    async def _deliver_batches(self, batches: List[str], previous: Optional[asyncio.Task]) -> None:
+        # Keep batches in order behind the flush before this one
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        for batch in batches:
+            await self._deliver(batch)
+
+    async def _deliver(self, message: str, reply_markup=None) -> None:
         """Sends a message to all configured admin user IDs."""
         app = self._application
         if not app:
@@ -49,16 +104,22 @@ class NotificationService:
             print("Warning: No ADMIN_USER_IDS configured. Cannot send notification.")
             return
 
-        for user_id in ADMIN_USER_IDS:
-            try:
-                await app.bot.send_message(
+        # Fan out to all admins at once; the bot's rate limiter paces the calls
+        results = await asyncio.gather(
+            *(
+                app.bot.send_message(
                     chat_id=user_id, 
                     text=message,
                     reply_markup=reply_markup,
                     parse_mode="HTML"
                 )
-            except Exception as e:
-                print(f"Error sending notification to {user_id}: {e}")
+                for user_id in ADMIN_USER_IDS
+            ),
+            return_exceptions=True,
+        )
+        for user_id, result in zip(ADMIN_USER_IDS, results):
+            if isinstance(result, Exception):
+                print(f"Error sending notification to {user_id}: {result}")
 
     async def _handle_task_status_change(self, event: Event) -> None:
         payload = event.payload
@@ -95,8 +156,6 @@ class NotificationService:
     async def send_approval_request(self, task_id: str, title: str, tools: List[str]) -> None:
         """Sends a message with Approve/Deny buttons to admins."""
         if not self._application: return
-        
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
         tools_str = ", ".join(tools)
         text = (
@@ -119,7 +178,6 @@ class NotificationService:
     async def send_plan_approval_request(self, parent_id: str, title: str, subtasks_count: int) -> None:
         """Sends a specific notification for plan approval."""
         if not self._application: return
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
         text = (
             f"📋 <b>Plan Review Needed</b>\n"
@@ -159,9 +159,10 @@ class PlanDirector:
         done = [t for t in subtasks if t.status == TaskStatus.DONE]
         
         if len(done) == total:
-            summary = "### Consolidated Execution Summary\n\n"
-            for t in subtasks:
-                summary += f"**Task:** {t.title}\n**Result:** {t.result_summary or 'Completed.'}\n\n"
+            summary = "### Consolidated Execution Summary\n\n" + "".join(
+                f"**Task:** {t.title}\n**Result:** {t.result_summary or 'Completed.'}\n\n"
+                for t in subtasks
+            )
             
             await self.task_store.update_task(
                 parent_id,
@@ -223,9 +224,9 @@ class PlanDirector:
             siblings = self.task_store.get_subtasks(task.parent_id)
             done_siblings = [s for s in siblings if s.status == TaskStatus.DONE and s.id != task_id]
             if done_siblings:
-                sibling_context = "### Context from Previous Steps:\n"
-                for s in done_siblings:
-                    sibling_context += f"- {s.title}: {s.result_summary}\n"
+                sibling_context = "### Context from Previous Steps:\n" + "".join(
+                    f"- {s.title}: {s.result_summary}\n" for s in done_siblings
+                )
 
         prompt = (
             f"Objective: '{task.title}'\n"
@@ -246,11 +247,11 @@ class PlanDirector:
             logger.info(f"Task {task_id} running with {agent_id}")
             full_response = ""
             async for chunk in agent.stream(prompt):
-                if hasattr(chunk, 'content') and chunk.content:
+                if chunk.content:
                     full_response += chunk.content
                     if task_id in self.processing_tasks:
                         self.processing_tasks[task_id]['last_activity'] = time.time()
-                if hasattr(chunk, 'tool_call') and chunk.tool_call:
+                if chunk.tool_call:
                     if task_id in self.processing_tasks:
                         self.processing_tasks[task_id]['tool_calls'] += 1
 
@@ -1,11 +1,11 @@
 
 import asyncio
 import logging
-import html
 from typing import List, Dict, Any
 from src.domain.event import Event, EventType
 from src.infrastructure.event_bus import EventBus
 from src.tools.gmail_tool import GmailSearchTool
+from src.services.telegram_bot.formatting import escape_html
 
 logger = logging.getLogger(__name__)
 
@@ -59,12 +59,13 @@ class ProactiveObserver:
                     from src.services.notification_service import get_notification_service
                     notifier = get_notification_service()
                     
-                    msg = f"📬 <b>Proactive Gmail Alert</b>\nYou have {count} unread emails.\n"
+                    parts = [f"📬 <b>Proactive Gmail Alert</b>\nYou have {count} unread emails.\n"]
                     for em in emails[:3]:
                         # Escape HTML characters to prevent Telegram parse errors
-                        safe_from = html.escape(em['from'])
-                        safe_subject = html.escape(em['subject'])
-                        msg += f"\n• From: {safe_from}\n  Subj: {safe_subject}"
+                        safe_from = escape_html(em['from'])
+                        safe_subject = escape_html(em['subject'])
+                        parts.append(f"\n• From: {safe_from}\n  Subj: {safe_subject}")
+                    msg = "".join(parts)
                     
                     await notifier.send_custom_notification(msg)
             
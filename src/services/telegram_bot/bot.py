@@ -1,71 +1,249 @@
 from functools import wraps
 import os
-import html
 import logging
 import asyncio
-import time
-from typing import Dict, Optional
+import itertools
+import random
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 from app.app_context import get_app_context
 from infrastructure.command_bus import CommandBus
 from infrastructure.singleton import Singleton
 from src.domain.event import Event, EventType
-from telegram import InlineKeyboardMarkup, Update, constants
+from telegram import Bot, InlineKeyboardMarkup, Update, User, constants
 from telegram.request import HTTPXRequest
 from telegram.error import BadRequest, TimedOut, NetworkError, RetryAfter, TelegramError
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     ApplicationBuilder,
-    CallbackQueryHandler,
     ContextTypes,
-    CommandHandler,
-    MessageHandler,
-    filters,
+    TypeHandler,
+    Updater,
 )
 
 from src.services.notification_service import get_notification_service
-from src.services.telegram_bot.config import AUTHORIZED_USERS
-
-# Configure Logging
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
+from src.services.telegram_bot.config import (
+    AUTHORIZED_USERS,
+    TELEGRAM_USE_WEBHOOK,
+    TELEGRAM_WEBHOOK_LISTEN,
+    TELEGRAM_WEBHOOK_PORT,
+    TELEGRAM_WEBHOOK_SECRET,
+    TELEGRAM_WEBHOOK_URL,
 )
+
+# Logging is configured by the application entry point (main.setup_logging)
 logger = logging.getLogger(__name__)
 
+# Upper bound on chats tracked in _chat_state
+MAX_TRACKED_CHATS = 10_000
+# Least recently used chats considered when picking an eviction victim
+EVICTION_SAMPLE = 16
+
+TYPING_DELAY = 0.8  # Seconds to wait before showing the typing indicator
+TYPING_INTERVAL = 4  # Seconds between typing actions (Telegram clears them after ~5s)
+# Messages a user sends within this many seconds are forwarded as one turn
+INBOX_BATCH_WINDOW = 0.2
+
+
+@dataclass(slots=True)
+class ChatState:
+    """Everything the bot tracks for one chat."""
+    # The LAST message ID sent by the bot in this chat
+    last_msg_id: Optional[int] = None
+    # Event-loop monotonic time that message was sent, to expire it after MESSAGE_TTL
+    last_msg_ts: float = 0.0
+    # Event-loop monotonic time before which intermediate edits must wait
+    next_edit_ts: float = 0.0
+    # The last (text, reply_markup, parse_mode) delivered, so no-op edits are
+    # skipped locally instead of costing an API round-trip
+    last_sent: Optional[Tuple[str, Optional[InlineKeyboardMarkup], Optional[str]]] = None
+    typing_task: Optional[asyncio.Task] = None
+    # Pending delayed typing start, cancelled if the reply arrives first
+    typing_timer: Optional[asyncio.TimerHandle] = None
+    # Newest streaming frame not yet delivered: (text, reply_markup, prefer_edit)
+    pending: Optional[Tuple[str, Optional[InlineKeyboardMarkup], bool]] = None
+    # Task delivering `pending` at the edit rate limit, while there is one
+    flusher: Optional[asyncio.Task] = None
+    # Set to wake the flusher early (final update or shutdown)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    # User texts waiting to be forwarded to the agent as one turn
+    inbox: List[str] = field(default_factory=list)
+    inbox_timer: Optional[asyncio.TimerHandle] = None
+    # Logical times of the two most recent accesses (older first), for LRU-2
+    access_history: Tuple[int, int] = (0, 0)
+
+    def touch(self, now: int) -> None:
+        self.access_history = (self.access_history[1], now)
+
+    def cancel_typing(self) -> Optional[asyncio.Task]:
+        """Stop the typing indicator; returns the cancelled task, if any."""
+        if self.typing_timer:
+            self.typing_timer.cancel()
+            self.typing_timer = None
+        task, self.typing_task = self.typing_task, None
+        if task and not task.done():
+            task.cancel()
+            return task
+        return None
+
+
 # Global State
 # _task_store = Singleton.get_task_store()
 
-# Tracks the LAST message ID sent by the bot for a given chat.
-_bot_messages: Dict[int, int] = {}
-# Track typing tasks
-_typing_tasks: Dict[int, asyncio.Task] = {}
+# Per-chat state in LRU order (least recently used first)
+_chat_state: "OrderedDict[int, ChatState]" = OrderedDict()
+_access_clock = itertools.count(1)
+
+
+def _get_state(chat_id: int) -> ChatState:
+    """Return the chat's state, creating it if needed, and record the access.
+
+    Once more than MAX_TRACKED_CHATS chats are tracked one is dropped (its typing
+    indicator cancelled); its next reply is simply sent as a new message.
+    """
+    state = _chat_state.get(chat_id)
+    if state is not None:
+        _chat_state.move_to_end(chat_id)
+    else:
+        if len(_chat_state) >= MAX_TRACKED_CHATS:
+            _evict_one()
+        state = _chat_state[chat_id] = ChatState()
+    state.touch(next(_access_clock))
+    return state
+
+
+def _evict_one() -> None:
+    """Evict by LRU-2 among the least recently used chats.
+
+    The victim is the sampled chat whose second most recent access is oldest, so
+    chats seen only once (a broadcast to idle users, say) go before interactive
+    chats that happened to be quiet for a moment.
+    """
+    candidates = itertools.islice(_chat_state.items(), EVICTION_SAMPLE)
+    victim_id, victim = min(candidates, key=lambda item: item[1].access_history[0])
+    del _chat_state[victim_id]
+    victim.cancel_typing()
+
 
-# Rate limiting state
-_last_update_time: Dict[int, float] = {}
 UPDATE_INTERVAL = 1.0  # Seconds between edits
+# Messages older than this are no longer edited; a new one is sent instead
+MESSAGE_TTL = 47 * 3600  # seconds, inside Telegram's 48h edit window
+
+# Appended when a message exceeds Telegram's length limit
+TRUNCATION_SUFFIX = "\n\n...(message truncated)"
+
+# Task status -> emoji shown in task listings (the /tasks command, currently disabled)
+_STATUS_EMOJI: Dict[str, str] = {
+    "todo": "⏳",
+    "in_progress": "🔄",
+    "blocked": "⚠️",
+    "waiting_approval": "👀",
+    "waiting_review": "🔎",
+}
+
+# Callback data prefix -> (carries a task id after ':', approved)
+_CB_HANDLERS: Dict[str, Tuple[bool, bool]] = {
+    "approve_task": (True, True),
+    "deny_task": (True, False),
+    "approve": (False, True),
+    "deny": (False, False),
+}
+
+# Source tag for events originating from Telegram updates
+_TELEGRAM_SOURCE = "telegram"
 
 # Reconnection settings
 MAX_RECONNECT_ATTEMPTS = 5
 RECONNECT_DELAY = 5  # seconds
 
+# Connection pool settings (shared by polling and outgoing API calls)
+CONNECTION_POOL_SIZE = 20
+LONG_POLL_TIMEOUT = 50  # Seconds Telegram may hold a getUpdates request open
 
-def authorized_only(func):
-    @wraps(func)
-    async def wrapped(self, *args, **kwargs):
-        # Handle both (update, context) and (self, update, context)
-        update = next((arg for arg in args if isinstance(arg, Update)), None)
-        
-        if not update or not update.effective_user:
-            return await func(self, *args, **kwargs)
+# Bot API calls per second across all chats (Telegram's broadcast limit)
+RATE_LIMIT_PER_SECOND = 30
+
+# Retry settings for transient send/edit failures
+MAX_SEND_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 8.0  # seconds, before jitter
+
+
+# BadRequest message prefixes (as normalised by PTB's TelegramError.message)
+# mapped to the TelegramBotService method that handles them during an edit.
+_BADREQ_HANDLERS: Dict[str, str] = {
+    "Message is not modified": "_ignore_not_modified",
+    "Can't parse entities": "_retry_edit_plain",
+    "Message to edit not found": "_resend_deleted_message",
+}
+# All prefixes in one alternation, so classifying an error is a single scan
+_BADREQ_PATTERN = re.compile("|".join(map(re.escape, _BADREQ_HANDLERS)))
 
-        user_id = update.effective_user.id
 
-        if user_id not in AUTHORIZED_USERS:
-            logger.warning(f"Unauthorized access attempt: {user_id}")
+def _telegram_event(event_type: EventType, payload: Dict[str, Any]) -> Event:
+    """Build a bus Event from handler data, skipping pydantic validation (the fields are already well-typed)."""
+    return Event.model_construct(type=event_type, payload=payload, source=_TELEGRAM_SOURCE)
+
+
+def _prepare_text(text: str) -> str:
+    """Trim surrounding whitespace and truncate to fit Telegram's message length limit."""
+    # Only pay for a stripped copy when there is whitespace to strip
+    if text and (text[0].isspace() or text[-1].isspace()):
+        text = text.strip()
+    if len(text) > 4000:
+        text = text[:3950] + TRUNCATION_SUFFIX
+    return text
+
+
+def retry_transient(catch=(RetryAfter, TimedOut, NetworkError), max_attempts=MAX_SEND_ATTEMPTS):
+    """Retry an async Bot API call on transient errors, with exponential backoff and jitter.
+
+    A RetryAfter's wait is used as the minimum delay. BadRequest (which PTB derives
+    from NetworkError) is never retried, since resending the same request can't fix it.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapped(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except BadRequest:
+                    raise
+                except catch as e:
+                    if attempt == max_attempts:
+                        raise
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    delay *= random.uniform(0.5, 1.5)
+                    if isinstance(e, RetryAfter):
+                        delay = max(delay, e.retry_after)
+                    logger.warning(
+                        "Telegram call failed (attempt %d/%d), retrying in %.1fs: %s",
+                        attempt, max_attempts, delay, e,
+                    )
+                    await asyncio.sleep(delay)
+        return wrapped
+    return decorator
+
+
+def authorized_only(func):
+    # Bind the whitelist once per handler instead of a global lookup per update
+    authorized = AUTHORIZED_USERS
+
+    @wraps(func)
+    async def wrapped(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        # PTB invokes bound handlers as (update, context)
+        user = update.effective_user
+        if user is not None and user.id not in authorized:
+            logger.warning("Unauthorized access attempt: %s", user.id)
             if update.message:
                 await update.message.reply_text("🚫 Access Denied.")
             return
 
-        return await func(self, *args, **kwargs)
+        return await func(self, update, context)
     return wrapped
 
 
@@ -75,8 +253,15 @@ class TelegramBotService:
         self.application: Optional[Application] = None
         self.bus = get_app_context().command_bus
         self._running = False
-        self._shutdown_event = asyncio.Event()
+        # One-shot shutdown signal, created on the running loop in start()
+        self._shutdown_future: Optional[asyncio.Future] = None
         self._polling_task: Optional[asyncio.Task] = None
+        self._bot_identity: Optional[User] = None
+        # Shortcuts to application.bot / application.updater for the hot paths
+        self._bot: Optional[Bot] = None
+        self._updater: Optional[Updater] = None
+        # "/command" -> handler, filled in by _initialize_bot
+        self._command_dispatch: Dict[str, Callable[..., Awaitable[None]]] = {}
 
     async def start(self):
         """Start the telegram bot service with error handling and reconnection logic"""
@@ -89,24 +274,28 @@ class TelegramBotService:
             return
 
         self._running = True
+        self._shutdown_future = asyncio.get_running_loop().create_future()
         attempt = 0
 
         while self._running and attempt < MAX_RECONNECT_ATTEMPTS:
             try:
                 await self._initialize_bot()
-                await self._start_polling()
+                if TELEGRAM_USE_WEBHOOK and TELEGRAM_WEBHOOK_URL:
+                    await self._start_webhook()
+                else:
+                    await self._start_polling()
                 logger.info("🤖 Telegram Bot Started Successfully")
                 
                 # Wait for shutdown signal
-                await self._shutdown_event.wait()
+                await self._shutdown_future
                 break
                 
             except Exception as e:
                 attempt += 1
-                logger.error(f"Error starting bot (attempt {attempt}/{MAX_RECONNECT_ATTEMPTS}): {e}", exc_info=True)
+                logger.error("Error starting bot (attempt %s/%s): %s", attempt, MAX_RECONNECT_ATTEMPTS, e, exc_info=True)
                 
                 if attempt < MAX_RECONNECT_ATTEMPTS and self._running:
-                    logger.info(f"Retrying in {RECONNECT_DELAY} seconds...")
+                    logger.info("Retrying in %s seconds...", RECONNECT_DELAY)
                     await asyncio.sleep(RECONNECT_DELAY)
                 else:
                     logger.critical("Max reconnection attempts reached. Bot service failed to start.")
@@ -114,33 +303,40 @@ class TelegramBotService:
 
     async def _initialize_bot(self):
         """Initialize the telegram application and handlers"""
-        request = HTTPXRequest(
-            connection_pool_size=20,
-            read_timeout=30.0,
-            write_timeout=30.0,
-            connect_timeout=30.0,
-            pool_timeout=30.0
-        )
+        try:
+            request = self._build_request(http_version="2")
+        except RuntimeError:
+            logger.warning("HTTP/2 not available, falling back to HTTP/1.1")
+            request = self._build_request(http_version="1.1")
 
-        self.application = (
+        # Polling and sending share one pool so TLS connections are reused
+        builder = (
             ApplicationBuilder()
             .token(self.token)
             .request(request)
-            .build()
+            .get_updates_request(request)
         )
-
-        # Command Handlers
-        self.application.add_handler(CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("reset", self.reset_command))
-        # self.application.add_handler(CommandHandler("tasks", self.tasks_command))
-        
-        # Message Handler
-        self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
-        )
-        
-        # Callback Handler
-        self.application.add_handler(CallbackQueryHandler(self.button_callback))
+        try:
+            # Pace API calls against Telegram's global and per-group limits so
+            # bursts across chats queue instead of failing with RetryAfter.
+            # RetryAfter retries stay with retry_transient (max_retries=0).
+            builder = builder.rate_limiter(
+                AIORateLimiter(overall_max_rate=RATE_LIMIT_PER_SECOND, max_retries=0)
+            )
+        except RuntimeError:
+            logger.warning("aiolimiter not installed, sending without a rate limiter")
+        self.application = builder.build()
+        self._bot = self.application.bot
+        self._updater = self.application.updater
+
+        # A single handler routes every update, so PTB doesn't run each
+        # registered handler's filters in turn
+        self._command_dispatch = {
+            "/start": self.start_command,
+            "/reset": self.reset_command,
+            # "/tasks": self.tasks_command,
+        }
+        self.application.add_handler(TypeHandler(Update, self._dispatch))
 
         # Register with notification service
         notification_service = get_notification_service()
@@ -149,23 +345,59 @@ class TelegramBotService:
         # Initialize the application
         await self.application.initialize()
         await self.application.start()
+
+        # initialize() already called getMe; keep the identity for health checks
+        self._bot_identity = self._bot.bot
         
         logger.info("✅ Telegram application initialized")
 
+    @staticmethod
+    def _build_request(http_version: str) -> HTTPXRequest:
+        """Build the pooled request object used for every Bot API call"""
+        return HTTPXRequest(
+            connection_pool_size=CONNECTION_POOL_SIZE,
+            read_timeout=30.0,
+            write_timeout=30.0,
+            connect_timeout=30.0,
+            pool_timeout=30.0,
+            http_version=http_version,
+        )
+
     async def _start_polling(self):
         """Start polling with proper error handling"""
         try:
-            await self.application.updater.start_polling(
-                poll_interval=1.0,
-                timeout=10,
-                read_timeout=20,
+            await self._updater.start_polling(
+                # Long polling: Telegram holds getUpdates open until an update
+                # arrives or LONG_POLL_TIMEOUT passes. PTB adds the timeout to
+                # read_timeout, so the client waits LONG_POLL_TIMEOUT + 5s.
+                poll_interval=0.0,
+                timeout=LONG_POLL_TIMEOUT,
+                read_timeout=5,
                 write_timeout=20,
                 drop_pending_updates=False,
                 allowed_updates=Update.ALL_TYPES,
             )
             logger.info("🔄 Telegram Polling Active")
         except Exception as e:
-            logger.error(f"Error starting polling: {e}", exc_info=True)
+            logger.error("Error starting polling: %s", e, exc_info=True)
+            raise
+
+    async def _start_webhook(self):
+        """Register the webhook and serve updates pushed by Telegram"""
+        try:
+            await self._updater.start_webhook(
+                listen=TELEGRAM_WEBHOOK_LISTEN,
+                port=TELEGRAM_WEBHOOK_PORT,
+                # Serve on the same path Telegram will post to
+                url_path=urlparse(TELEGRAM_WEBHOOK_URL).path.lstrip("/"),
+                webhook_url=TELEGRAM_WEBHOOK_URL,
+                secret_token=TELEGRAM_WEBHOOK_SECRET,
+                drop_pending_updates=False,
+                allowed_updates=Update.ALL_TYPES,
+            )
+            logger.info("🔗 Telegram Webhook Active on port %s", TELEGRAM_WEBHOOK_PORT)
+        except Exception as e:
+            logger.error("Error starting webhook: %s", e, exc_info=True)
             raise
 
     async def stop(self):
@@ -176,139 +408,248 @@ class TelegramBotService:
         logger.info("🛑 Stopping Telegram Bot Service...")
         self._running = False
         
-        # Signal shutdown event
-        self._shutdown_event.set()
-        
-        # Cancel all typing tasks
-        for chat_id, task in list(_typing_tasks.items()):
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        _typing_tasks.clear()
+        # Signal shutdown
+        if self._shutdown_future and not self._shutdown_future.done():
+            self._shutdown_future.set_result(None)
         
-        # Stop the application
+        # Cancel typing tasks, drain pending flushes and stop fetching updates
+        # concurrently; awaiting the cancelled tasks avoids "Task was destroyed
+        # but it is pending" warnings
+        pending = [task for state in _chat_state.values() if (task := state.cancel_typing())]
+        for chat_id, state in _chat_state.items():
+            # Hand buffered user messages to the bus rather than dropping them
+            if state.inbox_timer is not None:
+                state.inbox_timer.cancel()
+                self._flush_inbox(chat_id, state)
+            if state.flusher is not None:
+                state.wakeup.set()
+                pending.append(state.flusher)
+        if self._updater is not None and self._updater.running:
+            pending.append(self._updater.stop())
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Error during shutdown: %s", result, exc_info=result)
+
+        # Stop the application (PTB requires stop() before shutdown())
         if self.application:
             try:
-                if self.application.updater.running:
-                    await self.application.updater.stop()
                 await self.application.stop()
                 await self.application.shutdown()
                 logger.info("✅ Telegram application stopped")
             except Exception as e:
-                logger.error(f"Error during shutdown: {e}", exc_info=True)
+                logger.error("Error during shutdown: %s", e, exc_info=True)
         
         # Clear message tracking
-        _bot_messages.clear()
-        _last_update_time.clear()
+        _chat_state.clear()
 
     async def _typing_loop(self, chat_id: int):
-        """Sends the typing action every 4 seconds until cancelled."""
+        """Keep the typing indicator up until the reply starts.
+
+        Telegram clears the action after ~5s, so it is re-sent every
+        TYPING_INTERVAL while the agent is still silent. The first streamed
+        text cancels this task, so a turn costs one action per interval of
+        silence rather than one per chunk. A failed action ends the loop.
+        """
         try:
             while True:
-                if self.application and self._running:
-                    try:
-                        await self.application.bot.send_chat_action(
-                            chat_id=chat_id, 
-                            action=constants.ChatAction.TYPING
-                        )
-                    except TelegramError as e:
-                        logger.debug(f"Typing action failed for chat {chat_id}: {e}")
-                        break
-                await asyncio.sleep(4)
-        except asyncio.CancelledError:
-            logger.debug(f"Typing loop cancelled for chat {chat_id}")
-        except Exception as e:
-            logger.error(f"Typing loop error for chat {chat_id}: {e}", exc_info=True)
+                await self._bot.send_chat_action(
+                    chat_id=chat_id,
+                    action=constants.ChatAction.TYPING
+                )
+                await asyncio.sleep(TYPING_INTERVAL)
+        except (TelegramError, OSError) as e:
+            logger.debug("Typing action failed for chat %s: %s", chat_id, e)
         finally:
             # Clean up the task reference
-            if chat_id in _typing_tasks:
-                del _typing_tasks[chat_id]
+            state = _chat_state.get(chat_id)
+            if state and state.typing_task is asyncio.current_task():
+                state.typing_task = None
+
+    def _schedule_typing(self, chat_id: int, state: ChatState):
+        """Start the typing indicator after TYPING_DELAY unless a reply lands first"""
+        if state.typing_timer:
+            state.typing_timer.cancel()
+        loop = asyncio.get_running_loop()
+        state.typing_timer = loop.call_later(TYPING_DELAY, self._start_typing, chat_id, state)
+
+    def _start_typing(self, chat_id: int, state: ChatState):
+        state.typing_timer = None
+        if state.typing_task is not None and not state.typing_task.done():
+            return
+        if self.application and self._running:
+            state.typing_task = asyncio.create_task(self._typing_loop(chat_id))
+
+    def show_typing(self, chat_id: int):
+        """Start the typing indicator now, e.g. after a status message ended it"""
+        self._start_typing(chat_id, _get_state(chat_id))
 
     def _cancel_typing(self, chat_id: int):
         """Cancel typing indicator for a specific chat"""
-        if chat_id in _typing_tasks:
-            task = _typing_tasks[chat_id]
-            if not task.done():
-                task.cancel()
-            del _typing_tasks[chat_id]
+        state = _chat_state.get(chat_id)
+        if state:
+            state.cancel_typing()
 
     async def send_or_edit(
         self,
         chat_id: int,
         text: str,
         reply_markup: InlineKeyboardMarkup | None = None,
-        is_final: bool = False
+        is_final: bool = False,
+        prefer_edit: bool = True
     ):
-        """Send or edit a message with rate limiting and error handling"""
+        """Send or edit a message with rate limiting and error handling.
+
+        Intermediate (non-final) updates are coalesced: only the newest one is
+        delivered, at most once per UPDATE_INTERVAL. The final update is sent
+        right away, after any delivery already in flight.
+
+        Pass prefer_edit=False when the caller knows the tracked message is
+        stale, so a new message is sent without attempting an edit first. The
+        request carries over to any update that supersedes it undelivered.
+        """
         if not self.application or not self._running:
             logger.warning("Cannot send message: bot not running")
             return
 
-        bot = self.application.bot
-        safe_text = text.strip()
-        
-        # If text is empty and it's final, stop typing
-        if not safe_text and is_final:
-            self._cancel_typing(chat_id)
+        state = _get_state(chat_id)
+
+        if not is_final:
+            # Hot path for streamed chunks. Latest wins: replace any undelivered
+            # frame and let the flusher deliver it once the rate limit allows;
+            # it is only trimmed and truncated if it actually gets sent.
+            if text:
+                # A reply is on its way; it supersedes any typing indicator
+                state.cancel_typing()
+                if state.pending is not None and not state.pending[2]:
+                    prefer_edit = False
+                state.pending = (text, reply_markup, prefer_edit)
+                if state.flusher is None:
+                    state.flusher = asyncio.create_task(self._flush_pending(chat_id, state))
             return
-            
+
+        # The final reply ends the typing indicator, even when there is nothing to show
+        state.cancel_typing()
+        safe_text = _prepare_text(text)
         if not safe_text:
             return
 
-        # Cancel typing if we are sending a substantial update or finishing
-        if is_final or len(safe_text) > 50:
-            self._cancel_typing(chat_id)
+        # The final text supersedes any pending frame; let an in-flight
+        # delivery finish so the final edit lands last
+        if state.pending is not None and not state.pending[2]:
+            prefer_edit = False
+        state.pending = None
+        if state.flusher is not None:
+            state.wakeup.set()
+            await asyncio.gather(state.flusher, return_exceptions=True)
+
+        # Only ask Telegram to parse HTML when the text can contain tags
+        parse_mode = (
+            constants.ParseMode.HTML
+            if "<" in safe_text and ">" in safe_text
+            else None
+        )
 
-        # Truncate if too long
-        if len(safe_text) > 4000:
-            safe_text = safe_text[:3950] + "\n\n...(message truncated)"
+        # Monotonic loop clock: immune to wall-clock jumps, no extra syscall
+        now = asyncio.get_running_loop().time()
+        await self._do_send(chat_id, state, safe_text, parse_mode, reply_markup, now, is_final, prefer_edit)
 
-        # Rate Limiting Logic
-        now = time.time()
-        last_time = _last_update_time.get(chat_id, 0)
-        
-        if not is_final and (now - last_time) < UPDATE_INTERVAL:
-            # Skip update to prevent flood limits
-            return
+    async def _flush_pending(self, chat_id: int, state: ChatState):
+        """Deliver the chat's newest pending frame, pacing edits by UPDATE_INTERVAL"""
+        loop = asyncio.get_running_loop()
+        try:
+            while state.pending is not None and self._running:
+                delay = state.next_edit_ts - loop.time()
+                if delay > 0:
+                    state.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(state.wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                (text, reply_markup, prefer_edit), state.pending = state.pending, None
+                text = _prepare_text(text)
+                if not text:
+                    continue
+                await self._do_send(chat_id, state, text, None, reply_markup, loop.time(), False, prefer_edit)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error("Flush error for chat %s: %s", chat_id, e, exc_info=True)
+        finally:
+            state.flusher = None
+
+    # Sending again after a timeout could post the message twice, so sends
+    # only retry when Telegram says it rejected the request.
+    @retry_transient(catch=(RetryAfter,))
+    async def _api_send(self, chat_id: int, text: str, parse_mode, reply_markup):
+        return await self._bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup,
+        )
 
-        # Determine parse mode
-        parse_mode = constants.ParseMode.HTML if is_final else None
+    @retry_transient()
+    async def _api_edit(self, chat_id: int, message_id: int, text: str, parse_mode, reply_markup):
+        return await self._bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup,
+        )
 
-        # Send new message or edit existing
-        if chat_id not in _bot_messages:
-            await self._send_new_message(chat_id, safe_text, parse_mode, reply_markup, now)
+    async def _do_send(
+        self,
+        chat_id: int,
+        state: ChatState,
+        text: str,
+        parse_mode,
+        reply_markup,
+        timestamp: float,
+        is_final: bool,
+        prefer_edit: bool
+    ):
+        """Pick the edit or send path up front instead of relying on a failed edit"""
+        if not prefer_edit or timestamp - state.last_msg_ts > MESSAGE_TTL:
+            state.last_msg_id = None
+
+        if state.last_msg_id is not None:
+            await self._edit_existing_message(chat_id, state, text, parse_mode, reply_markup, timestamp, is_final)
         else:
-            await self._edit_existing_message(chat_id, safe_text, parse_mode, reply_markup, now, is_final)
+            await self._send_new_message(chat_id, state, text, parse_mode, reply_markup, timestamp)
 
     async def _send_new_message(
         self, 
         chat_id: int, 
+        state: ChatState,
         text: str, 
         parse_mode, 
         reply_markup, 
         timestamp: float
     ):
-        """Send a new message"""
+        """Send a new message, falling back to plain text if the HTML is rejected"""
         try:
-            msg = await self.application.bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=parse_mode,
-                reply_markup=reply_markup,
-            )
-            _bot_messages[chat_id] = msg.message_id
-            _last_update_time[chat_id] = timestamp
+            try:
+                msg = await self._api_send(chat_id, text, parse_mode, reply_markup)
+            except BadRequest as e:
+                if parse_mode is None or not e.message.startswith("Can't parse entities"):
+                    raise
+                logger.warning("HTML rejected for chat %s, sending as plain text: %s", chat_id, e)
+                msg = await self._api_send(chat_id, text, None, reply_markup)
+            state.last_msg_id = msg.message_id
+            state.last_msg_ts = timestamp
+            state.next_edit_ts = timestamp + UPDATE_INTERVAL
+            state.last_sent = (text, reply_markup, parse_mode)
         except TelegramError as e:
-            logger.error(f"Error sending new message to {chat_id}: {e}", exc_info=True)
+            logger.warning("Error sending new message to %s: %s", chat_id, e)
         except Exception as e:
-            logger.error(f"Unexpected error sending message to {chat_id}: {e}", exc_info=True)
+            logger.error("Unexpected error sending message to %s: %s", chat_id, e, exc_info=True)
 
     async def _edit_existing_message(
         self, 
         chat_id: int, 
+        state: ChatState,
         text: str, 
         parse_mode, 
         reply_markup, 
@@ -316,98 +657,118 @@ class TelegramBotService:
         is_final: bool
     ):
         """Edit an existing message with retry logic"""
+        # Compare with what was actually sent: message.text from Telegram has
+        # the HTML stripped and would never match the formatted text
+        content = (text, reply_markup, parse_mode)
+        if state.last_sent == content:
+            return
+
         try:
-            await self.application.bot.edit_message_text(
-                chat_id=chat_id,
-                message_id=_bot_messages[chat_id],
-                text=text,
-                parse_mode=parse_mode,
-                reply_markup=reply_markup,
-            )
-            _last_update_time[chat_id] = timestamp
-            
+            await self._api_edit(chat_id, state.last_msg_id, text, parse_mode, reply_markup)
+            state.next_edit_ts = timestamp + UPDATE_INTERVAL
+            state.last_sent = content
+
         except RetryAfter as e:
-            logger.warning(f"Rate limited by Telegram. Retry after {e.retry_after}s")
-            if is_final:
-                await asyncio.sleep(e.retry_after)
-                try:
-                    await self.application.bot.edit_message_text(
-                        chat_id=chat_id,
-                        message_id=_bot_messages[chat_id],
-                        text=text,
-                        parse_mode=parse_mode,
-                        reply_markup=reply_markup,
-                    )
-                except Exception as retry_error:
-                    logger.error(f"Retry edit failed: {retry_error}")
+            logger.warning("Rate limited by Telegram. Gave up after retrying: %s", e)
 
         except BadRequest as e:
-            error_msg = str(e).lower()
-            if "message is not modified" in error_msg:
-                # Message content is identical, this is fine
-                return
-            elif "can't parse entities" in error_msg:
-                # Retry without HTML parsing
-                try:
-                    await self.application.bot.edit_message_text(
-                        chat_id=chat_id,
-                        message_id=_bot_messages[chat_id],
-                        text=text,
-                        parse_mode=None,
-                        reply_markup=reply_markup,
-                    )
-                except Exception as parse_error:
-                    logger.error(f"Edit without parse mode failed: {parse_error}")
-            elif "message to edit not found" in error_msg:
-                # Message was deleted, send a new one
-                logger.warning(f"Message {_bot_messages[chat_id]} not found, sending new message")
-                del _bot_messages[chat_id]
-                await self._send_new_message(chat_id, text, parse_mode, reply_markup, timestamp)
+            match = _BADREQ_PATTERN.match(e.message)
+            if match:
+                handler = getattr(self, _BADREQ_HANDLERS[match.group()])
+                await handler(chat_id, state, text, parse_mode, reply_markup, timestamp)
             else:
-                logger.error(f"BadRequest editing message: {e}")
-                
+                logger.error("BadRequest editing message: %s", e)
+
         except (TimedOut, NetworkError) as e:
-            logger.warning(f"Telegram network issue during edit: {e}")
+            logger.warning("Telegram network issue during edit: %s", e)
         except TelegramError as e:
-            logger.error(f"Telegram error editing message: {e}", exc_info=True)
+            logger.warning("Telegram error editing message: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error editing message: {e}", exc_info=True)
+            logger.error("Unexpected error editing message: %s", e, exc_info=True)
+
+    async def _ignore_not_modified(self, chat_id, state, text, parse_mode, reply_markup, timestamp):
+        """Message content is identical, this is fine"""
+        state.last_sent = (text, reply_markup, parse_mode)
+
+    async def _retry_edit_plain(self, chat_id, state, text, parse_mode, reply_markup, timestamp):
+        """Retry the edit without HTML parsing"""
+        try:
+            await self._api_edit(chat_id, state.last_msg_id, text, None, reply_markup)
+            state.last_sent = (text, reply_markup, parse_mode)
+        except Exception as parse_error:
+            logger.error("Edit without parse mode failed: %s", parse_error)
+
+    async def _resend_deleted_message(self, chat_id, state, text, parse_mode, reply_markup, timestamp):
+        """Message was deleted, send a new one"""
+        logger.warning("Message %s not found, sending new message", state.last_msg_id)
+        state.last_msg_id = None
+        await self._send_new_message(chat_id, state, text, parse_mode, reply_markup, timestamp)
+
+    async def _dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route an update to its command, message or callback handler"""
+        if update.callback_query is not None:
+            await self.button_callback(update, context)
+            return
+
+        # Edited messages are ignored, so an edit can't start a second turn
+        message = update.message
+        if message is None or message.text is None:
+            return
+
+        text = message.text
+        if text.startswith("/"):
+            # "/cmd@BotName args" -> "/cmd"; commands addressed to another bot
+            # (e.g. in a group) and unknown commands are ignored
+            command, _, target = text.partition(" ")[0].partition("@")
+            if target and target.lower() != (self._bot.username or "").lower():
+                return
+            handler = self._command_dispatch.get(command)
+            if handler is not None:
+                await handler(update, context)
+            return
+
+        await self.handle_message(update, context)
 
     @authorized_only
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         try:
             chat_id = update.effective_chat.id
-            if chat_id in _bot_messages:
-                del _bot_messages[chat_id]
-            
-            self._cancel_typing(chat_id)
+            state = _get_state(chat_id)
+            state.last_msg_id = None
+
+            state.cancel_typing()
             await update.message.reply_text("Hi! I'm your engineering partner. Let's get to work.")
         except Exception as e:
-            logger.error(f"Error in start_command: {e}", exc_info=True)
+            logger.error("Error in start_command: %s", e, exc_info=True)
 
     @authorized_only
     async def reset_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /reset command"""
         try:
             chat_id = update.effective_chat.id
-            
-            await self.bus.send(Event(
-                type=EventType.USER_MESSAGE,
-                payload={
+            state = _get_state(chat_id)
+
+            # Deliver anything still buffered first, so it isn't run against
+            # the fresh session
+            if state.inbox_timer is not None:
+                state.inbox_timer.cancel()
+                self._flush_inbox(chat_id, state)
+
+            self.bus.send_nowait(_telegram_event(
+                EventType.USER_MESSAGE,
+                {
                     "chat_id": chat_id,
                     "text": "System: Please reset my session memory."
-                },
-                source="telegram"
+                }
             ))
             
-            if chat_id in _bot_messages:
-                del _bot_messages[chat_id]
-            
-            self._cancel_typing(chat_id)
+            state.last_msg_id = None
+
+            state.cancel_typing()
             await update.message.reply_text("🔄 Session reset request sent.")
         except Exception as e:
-            logger.error(f"Error in reset_command: {e}", exc_info=True)
+            logger.error("Error in reset_command: %s", e, exc_info=True)
             await update.message.reply_text("❌ Error resetting session. Please try again.")
 
     @authorized_only
@@ -417,36 +778,47 @@ class TelegramBotService:
             chat_id = update.effective_chat.id
             text = update.message.text
             
-            if chat_id in _bot_messages:
-                del _bot_messages[chat_id]
-            
-            logger.info(f"Received message from {chat_id}: {text[:50]}...")
-            
-            # Start typing indicator
-            if chat_id not in _typing_tasks or _typing_tasks[chat_id].done():
-                _typing_tasks[chat_id] = asyncio.create_task(self._typing_loop(chat_id))
-            
-            # Send message to command bus for main agent processing
-            await self.bus.send(Event(
-                type=EventType.USER_MESSAGE,
-                payload={
-                    "chat_id": chat_id,
-                    "text": text
-                },
-                source="telegram"
-            ))
-            
+            state = _get_state(chat_id)
+            state.last_msg_id = None
+
+            logger.info("Received message from %s: %.50s...", chat_id, text)
+
+            # Typing indicator until the reply starts (skipped entirely for fast replies)
+            self._schedule_typing(chat_id, state)
+
+            # Buffer the text; rapid-fire messages reach the agent as one turn
+            state.inbox.append(text)
+            if state.inbox_timer is None:
+                loop = asyncio.get_running_loop()
+                state.inbox_timer = loop.call_later(
+                    INBOX_BATCH_WINDOW, self._flush_inbox, chat_id, state
+                )
+
         except Exception as e:
-            logger.error(f"Error handling message: {e}", exc_info=True)
+            logger.error("Error handling message: %s", e, exc_info=True)
             self._cancel_typing(update.effective_chat.id)
             await update.message.reply_text("❌ Sorry, an error occurred processing your message.")
 
+    def _flush_inbox(self, chat_id: int, state: ChatState):
+        """Send the chat's buffered texts to the command bus as a single user message"""
+        state.inbox_timer = None
+        texts, state.inbox = state.inbox, []
+        if not texts:
+            return
+        self.bus.send_nowait(_telegram_event(
+            EventType.USER_MESSAGE,
+            {
+                "chat_id": chat_id,
+                "text": "\n".join(texts)
+            }
+        ))
+
     # @authorized_only
+    # Needs `import html` when re-enabled.
     # async def tasks_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
     #     """Handle /tasks command"""
     #     chat_id = update.effective_chat.id
-    #     if chat_id in _bot_messages:
-    #         del _bot_messages[chat_id]
+    #     _get_state(chat_id).last_msg_id = None
     #
     #     try:
     #         pending = _task_store.list_tasks(status=["todo", "in_progress", "blocked", "waiting_approval", "waiting_review"])
@@ -454,14 +826,16 @@ class TelegramBotService:
     #             await update.message.reply_text("✅ All clear!", parse_mode=constants.ParseMode.HTML)
     #             return
     #         
-    #         response = "📋 <b>Current Tasks</b>\n\n"
-    #         for task in pending:
-    #             emoji = {"todo": "⏳", "in_progress": "🔄", "blocked": "⚠️", "waiting_approval": "👀", "waiting_review": "🔎"}.get(task.status, "•")
-    #             response += f"{emoji} <b>{html.escape(task.title)}</b>\n   Status: {task.status}\n\n"
+    #         parts = ["📋 <b>Current Tasks</b>\n\n"]
+    #         parts.extend(
+    #             f"{_STATUS_EMOJI.get(task.status, '•')} <b>{html.escape(task.title)}</b>\n   Status: {task.status}\n\n"
+    #             for task in pending
+    #         )
+    #         response = "".join(parts)
     #         
     #         await update.message.reply_text(response, parse_mode=constants.ParseMode.HTML)
     #     except Exception as e:
-    #         logger.error(f"Error fetching tasks: {e}", exc_info=True)
+    #         logger.error("Error fetching tasks: %s", e, exc_info=True)
     #         await update.message.reply_text("❌ Error fetching tasks.")
 
     @authorized_only
@@ -471,32 +845,25 @@ class TelegramBotService:
             query = update.callback_query
             await query.answer()
             
-            data = query.data
-            task_id = None
-            approved = False
-            
-            if data.startswith("approve_task:"):
-                task_id = data.split(":", 1)[1]
-                approved = True
-            elif data.startswith("deny_task:"):
-                task_id = data.split(":", 1)[1]
-                approved = False
-            else:
-                # Fallback for generic approval
-                approved = (data == "approve")
+            prefix, sep, rest = query.data.partition(":")
+            action = _CB_HANDLERS.get(prefix)
+            if action is None:
+                logger.warning("Ignoring unknown callback data: %s", query.data)
+                return
+            has_task_id, approved = action
+            task_id = rest if has_task_id and sep else None
 
-            await self.bus.send(Event(
-                type=EventType.USER_APPROVAL,
-                payload={
+            self.bus.send_nowait(_telegram_event(
+                EventType.USER_APPROVAL,
+                {
                     "chat_id": query.message.chat_id,
                     "approved": approved,
                     "task_id": task_id
-                },
-                source="telegram"
+                }
             ))
             
         except Exception as e:
-            logger.error(f"Error in button_callback: {e}", exc_info=True)
+            logger.error("Error in button_callback: %s", e, exc_info=True)
             if query:
                 await query.answer("❌ Error processing your response")
 
@@ -510,9 +877,10 @@ class TelegramBotService:
             if not self.application or not self._running:
                 return False
             
-            # Try to get bot info
-            me = await self.application.bot.get_me()
-            return me is not None
+            # The bot identity never changes for a valid token, so use the
+            # cached getMe result instead of a network round-trip
+            updater = self._updater
+            return self._bot_identity is not None and updater is not None and updater.running
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             return False
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -26,18 +26,34 @@ def _parse_int_list(env_var_name: str) -> List[int]:
     return valid_ids
 
 # 2. Load Authorized Users (Whitelist)
-AUTHORIZED_USERS: List[int] = _parse_int_list("AUTHORIZED_USERS")
+# Stored as a frozenset: membership is checked on every incoming update.
+_authorized_user_list: List[int] = _parse_int_list("AUTHORIZED_USERS")
+AUTHORIZED_USERS: FrozenSet[int] = frozenset(_authorized_user_list)
+
+# The first user listed in the env var, used as the default recipient.
+PRIMARY_USER_ID: Optional[int] = _authorized_user_list[0] if _authorized_user_list else None
 
 # 3. Define Admin Users
 # Tries to load specific admins, otherwise defaults to the first authorized user.
 ADMIN_USER_IDS: List[int] = _parse_int_list("ADMIN_USER_IDS")
 
 # Fallback: If no admins defined, the first authorized user becomes admin
-if not ADMIN_USER_IDS and AUTHORIZED_USERS:
-    ADMIN_USER_IDS = [AUTHORIZED_USERS[0]]
+if not ADMIN_USER_IDS and PRIMARY_USER_ID is not None:
+    ADMIN_USER_IDS = [PRIMARY_USER_ID]
+
+# 4. Update Delivery (webhook vs long polling)
+# Polling is the default; set TELEGRAM_USE_WEBHOOK=true and a public HTTPS URL to
+# have Telegram push updates instead.
+TELEGRAM_USE_WEBHOOK = os.getenv("TELEGRAM_USE_WEBHOOK", "").strip().lower() in ("1", "true", "yes")
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET") or None
+TELEGRAM_WEBHOOK_LISTEN = os.getenv("TELEGRAM_WEBHOOK_LISTEN", "0.0.0.0")
+TELEGRAM_WEBHOOK_PORT = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
 
 # Validation Warning
 if not TELEGRAM_BOT_TOKEN:
     print("CRITICAL WARNING: TELEGRAM_BOT_TOKEN is missing from environment variables.")
 if not AUTHORIZED_USERS:
-    print("WARNING: AUTHORIZED_USERS is empty. Bot will be inaccessible until users are added.")
\ No newline at end of file
+    print("WARNING: AUTHORIZED_USERS is empty. Bot will be inaccessible until users are added.")
+if TELEGRAM_USE_WEBHOOK and not TELEGRAM_WEBHOOK_URL:
+    print("WARNING: TELEGRAM_USE_WEBHOOK is set but TELEGRAM_WEBHOOK_URL is empty. Falling back to polling.")
\ No newline at end of file
@@ -1,5 +1,9 @@
-import html
-from typing import Any, Dict, Union
+import re
+from typing import Any, Callable, Dict, Union
+
+# One C-level pass instead of html.escape's chain of str.replace calls
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_NEEDS_ESCAPE = re.compile(r"[&<>]")
 
 def escape_html(text: str) -> str:
     """
@@ -12,8 +16,19 @@ def escape_html(text: str) -> str:
         The escaped string.
     """
     if not isinstance(text, str):
-        return str(text)
-    return html.escape(text, quote=False)
+        text = str(text)
+    # Most text has nothing to escape; return it as-is rather than copying it
+    if _NEEDS_ESCAPE.search(text) is None:
+        return text
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+# Tool name -> summary of its input, looked up once per call
+_TOOL_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'read_file': lambda args: f"📖 Reading file: {escape_html(str(args.get('file_path') or args.get('path', 'unknown')))}",
+    'add_task': lambda args: f"➕ Adding task: {escape_html(str(args.get('title', 'Untitled')))}",
+    # Handle task_input if it's the key, or task_summary if that's preferred
+    'coder_agent': lambda args: f"🧑‍💻 Coder Agent: {escape_html(str(args.get('task_input') or args.get('task_summary', 'Working...')))}",
+}
 
 def format_tool_call(tool_name: str, tool_input: Union[Dict[str, Any], str, Any]) -> str:
     """
@@ -26,26 +41,13 @@ def format_tool_call(tool_name: str, tool_input: Union[Dict[str, Any], str, Any]
     Returns:
         A formatted string describing the tool call.
     """
-    if not isinstance(tool_input, dict):
-        # Fallback if input is not a dict
+    formatter = _TOOL_FORMATTERS.get(tool_name)
+    if formatter is None or not isinstance(tool_input, dict):
+        # Fallback for tools without a summary, or input that is not a dict
         return f"🔨 {escape_html(tool_name)}"
 
     try:
-        if tool_name == 'read_file':
-            path = tool_input.get('file_path') or tool_input.get('path', 'unknown')
-            return f"📖 Reading file: {escape_html(str(path))}"
-        
-        if tool_name == 'add_task':
-            title = tool_input.get('title', 'Untitled')
-            return f"➕ Adding task: {escape_html(str(title))}"
-        
-        if tool_name == 'coder_agent':
-            # Handle task_input if it's the key, or task_summary if that's preferred
-            summary = tool_input.get('task_input') or tool_input.get('task_summary', 'Working...')
-            return f"🧑‍💻 Coder Agent: {escape_html(str(summary))}"
-            
-        return f"🔨 {escape_html(tool_name)}"
-        
+        return formatter(tool_input)
     except Exception:
         # robust fallback
         return f"🔨 {escape_html(tool_name)}"
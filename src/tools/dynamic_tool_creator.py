@@ -1,11 +1,16 @@
+import hashlib
 import importlib.util
 import os
 import sys
-from typing import Optional, Type
+from typing import Dict, Optional, Tuple, Type
 from engine.registry.base_tool import BaseTool
 from engine.registry.tool_registry import ToolRegistry
 from engine.core.agent_instance_manager import get_agent_manager
 
+# tool_name -> (sha256 of its code, class_name, loaded class), so re-injecting
+# unchanged code skips the write/compile/exec round
+_INJECTED: Dict[str, Tuple[str, str, Type[BaseTool]]] = {}
+
 class DynamicToolCreatorTool(BaseTool):
     """
     A God-Mode tool that allows ValH to build and inject new tools into its own brain
@@ -25,19 +30,27 @@ class DynamicToolCreatorTool(BaseTool):
             if not os.path.exists(lib_path):
                 os.makedirs(lib_path, exist_ok=True)
 
-            # 2. Save the tool code to the library with UTF-8 encoding
-            file_path = f"{lib_path}/{tool_name}_tool.py"
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(code)
-            
-            # 3. Dynamically import the new tool
-            spec = importlib.util.spec_from_file_location(tool_name, file_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[tool_name] = module
-            spec.loader.exec_module(module)
-            
-            # 4. Get the tool class
-            tool_class = getattr(module, class_name)
+            code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+            cached = _INJECTED.get(tool_name)
+            if cached and cached[:2] == (code_hash, class_name):
+                # Same code as last time: reuse the class already loaded
+                tool_class = cached[2]
+            else:
+                # 2. Save the tool code to the library with UTF-8 encoding
+                file_path = f"{lib_path}/{tool_name}_tool.py"
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(code)
+
+                # 3. Dynamically import the new tool
+                spec = importlib.util.spec_from_file_location(tool_name, file_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[tool_name] = module
+                spec.loader.exec_module(module)
+
+                # 4. Get the tool class
+                tool_class = getattr(module, class_name)
+                _INJECTED[tool_name] = (code_hash, class_name, tool_class)
+
             new_tool_instance = tool_class()
             
             # 5. Inject into the ACTIVE Agent Manager
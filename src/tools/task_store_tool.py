@@ -71,9 +71,7 @@ class ListTasksTool(BaseTool):
                 return "No tasks found."
             
             output = "📋 **Task List**"
-            for t in tasks:
-                output += f"\n- {t.title} [{t.status.value}] (ID: {t.id})"
-            return output
+            return output + "".join(f"\n- {t.title} [{t.status.value}] (ID: {t.id})" for t in tasks)
         except ValueError as e:
             return f"❌ Error: {e}"
 
@@ -298,8 +296,6 @@ class ListSubtasksTool(BaseTool):
                 return f"No subtasks found for parent ID '{parent_id}'."
             
             output = f"📋 **Subtasks for Parent {parent_id}**"
-            for t in subtasks:
-                output += f"\n- {t.title} [{t.status.value}] (ID: {t.id})"
-            return output
+            return output + "".join(f"\n- {t.title} [{t.status.value}] (ID: {t.id})" for t in subtasks)
         except Exception as e:
             return f"❌ Error: {e}"
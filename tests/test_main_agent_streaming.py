@@ -0,0 +1,154 @@
+import asyncio
+import importlib.util
+import sys
+import types
+import pytest
+
+# main_agent only needs fastapi through the websocket manager; stand in for it
+# so the splitting and turn queue logic is tested without the web stack
+if importlib.util.find_spec("fastapi") is None:
+    _ws_stub = types.ModuleType("infrastructure.websocket_manager")
+    _ws_stub.get_websocket_manager = lambda: None
+    sys.modules.setdefault("infrastructure.websocket_manager", _ws_stub)
+
+import src.agents.main_agent as main_agent
+from src.agents.main_agent import MainAgent, STREAM_MESSAGE_LIMIT
+from domain.event import Event, EventType
+
+class RecordingBot:
+    def __init__(self):
+        self.sent = []
+        self.typing = []
+
+    async def send_or_edit(self, **kwargs):
+        self.sent.append(kwargs)
+
+    def show_typing(self, chat_id):
+        self.typing.append(chat_id)
+
+@pytest.fixture
+def agent():
+    # Only the bot and the turn bookkeeping are needed here
+    agent = MainAgent.__new__(MainAgent)
+    agent.bot = RecordingBot()
+    agent._chat_turns = {}
+    agent._agent_slots = asyncio.Semaphore(1)
+    return agent
+
+def user_message(chat_id, text, source="telegram"):
+    return Event(type=EventType.USER_MESSAGE, payload={"chat_id": chat_id, "text": text}, source=source)
+
+async def drain(agent):
+    while agent._chat_turns:
+        await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_short_reply_is_not_split(agent):
+    start = await agent._close_full_messages(1, "hello", 0, True)
+    assert start == 0
+    assert agent.bot.sent == []
+
+@pytest.mark.asyncio
+async def test_split_prefers_line_breaks(agent):
+    first = "a" * (STREAM_MESSAGE_LIMIT - 10)
+    text = first + "\n" + "b" * 100
+
+    start = await agent._close_full_messages(1, text, 0, True)
+
+    assert start == len(first)
+    assert agent.bot.sent == [
+        {"chat_id": 1, "text": first, "is_final": True, "prefer_edit": True}
+    ]
+
+@pytest.mark.asyncio
+async def test_split_without_line_breaks_cuts_at_limit(agent):
+    text = "x" * (STREAM_MESSAGE_LIMIT * 2 + 5)
+
+    start = await agent._close_full_messages(1, text, 0, True)
+
+    assert start == STREAM_MESSAGE_LIMIT * 2
+    assert [len(call["text"]) for call in agent.bot.sent] == [STREAM_MESSAGE_LIMIT] * 2
+    # Only the message being streamed is edited; later parts are new messages
+    assert [call["prefer_edit"] for call in agent.bot.sent] == [True, False]
+
+@pytest.mark.asyncio
+async def test_split_continues_from_offset(agent, monkeypatch):
+    monkeypatch.setattr(main_agent, "STREAM_MESSAGE_LIMIT", 10)
+    text = "0123456789" + "abcdefghij" + "xyz"
+
+    start = await agent._close_full_messages(1, text, 10, False)
+
+    assert start == 20
+    assert [call["text"] for call in agent.bot.sent] == ["abcdefghij"]
+
+@pytest.mark.asyncio
+async def test_chat_turns_run_in_order(agent, monkeypatch):
+    agent._agent_slots = asyncio.Semaphore(8)
+    log = []
+
+    async def handle(event):
+        log.append(("start", event.payload["text"]))
+        await asyncio.sleep(0)
+        log.append(("end", event.payload["text"]))
+
+    monkeypatch.setattr(agent, "_handle_user_message", handle)
+    agent._enqueue_turn(user_message(1, "first"))
+    agent._enqueue_turn(user_message(1, "second"))
+    await drain(agent)
+
+    assert log == [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")]
+
+@pytest.mark.asyncio
+async def test_queued_turn_gets_notice_and_typing(agent, monkeypatch):
+    release = asyncio.Event()
+
+    async def handle(event):
+        if event.payload["chat_id"] == 1:
+            await release.wait()
+
+    monkeypatch.setattr(agent, "_handle_user_message", handle)
+    agent._enqueue_turn(user_message(1, "busy"))
+    await asyncio.sleep(0)
+    agent._enqueue_turn(user_message(2, "waiting"))
+    await asyncio.sleep(0)
+
+    assert [call["chat_id"] for call in agent.bot.sent] == [2]
+    assert agent.bot.typing == []
+    release.set()
+    await drain(agent)
+    assert agent.bot.typing == [2]
+
+@pytest.mark.asyncio
+async def test_web_turns_get_no_queued_notice(agent, monkeypatch):
+    release = asyncio.Event()
+
+    async def handle(event):
+        if event.payload["chat_id"] == 1:
+            await release.wait()
+
+    monkeypatch.setattr(agent, "_handle_user_message", handle)
+    agent._enqueue_turn(user_message(1, "busy"))
+    await asyncio.sleep(0)
+    agent._enqueue_turn(user_message(2, "waiting", source="web_ui"))
+    await asyncio.sleep(0)
+    release.set()
+    await drain(agent)
+
+    assert agent.bot.sent == []
+
+@pytest.mark.asyncio
+async def test_failed_turn_does_not_drop_later_turns(agent, monkeypatch):
+    handled = []
+
+    async def handle(event):
+        if event.payload["text"] == "boom":
+            raise RuntimeError("agent crashed")
+        handled.append(event.payload["text"])
+
+    monkeypatch.setattr(agent, "_handle_user_message", handle)
+    agent._enqueue_turn(user_message(1, "boom"))
+    agent._enqueue_turn(user_message(1, "after"))
+    await drain(agent)
+
+    assert handled == ["after"]
+    assert agent._chat_turns == {}
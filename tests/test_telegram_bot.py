@@ -0,0 +1,146 @@
+import asyncio
+import types
+import pytest
+from telegram.error import BadRequest
+import src.services.telegram_bot.bot as bot
+
+class FakeBot:
+    """Records Bot API calls; queued errors are raised by the next matching call"""
+    def __init__(self):
+        self.calls = []
+        self.send_errors = []
+        self.edit_errors = []
+        self.next_id = 100
+
+    async def send_message(self, **kwargs):
+        self.calls.append(("send", kwargs))
+        if self.send_errors:
+            raise self.send_errors.pop(0)
+        self.next_id += 1
+        return types.SimpleNamespace(message_id=self.next_id)
+
+    async def edit_message_text(self, **kwargs):
+        self.calls.append(("edit", kwargs))
+        if self.edit_errors:
+            raise self.edit_errors.pop(0)
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    bot._chat_state.clear()
+    yield
+    for state in bot._chat_state.values():
+        state.cancel_typing()
+        if state.flusher is not None:
+            state.flusher.cancel()
+    bot._chat_state.clear()
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(bot, "get_app_context", lambda: types.SimpleNamespace(command_bus=None))
+    svc = bot.TelegramBotService("1:test")
+    fake = FakeBot()
+    svc.application = types.SimpleNamespace(bot=fake)
+    svc._bot = fake
+    svc._running = True
+    return svc, fake
+
+def test_lru_evicts_chat_seen_once(monkeypatch):
+    monkeypatch.setattr(bot, "MAX_TRACKED_CHATS", 3)
+    bot._get_state(1)
+    bot._get_state(2)
+    bot._get_state(1)  # chat 1 is interactive: its second access is recent
+    bot._get_state(3)
+    bot._get_state(4)
+
+    # Chat 1 is the least recently used, but chat 2 was only seen once
+    assert list(bot._chat_state) == [1, 3, 4]
+
+def test_lru_keeps_existing_state(monkeypatch):
+    monkeypatch.setattr(bot, "MAX_TRACKED_CHATS", 2)
+    state = bot._get_state(1)
+    state.last_msg_id = 42
+    bot._get_state(2)
+    assert bot._get_state(1) is state
+    assert len(bot._chat_state) == 2
+
+@pytest.mark.asyncio
+async def test_final_send_falls_back_to_plain_text(service):
+    svc, fake = service
+    fake.send_errors.append(BadRequest("Can't parse entities: unsupported start tag"))
+
+    await svc.send_or_edit(chat_id=7, text="<b>done</b>", is_final=True)
+
+    assert [(name, kw["parse_mode"]) for name, kw in fake.calls] == [("send", "HTML"), ("send", None)]
+    assert bot._chat_state[7].last_msg_id == 101
+
+@pytest.mark.asyncio
+async def test_send_reraises_other_bad_requests(service):
+    svc, fake = service
+    fake.send_errors.append(BadRequest("Chat not found"))
+
+    await svc.send_or_edit(chat_id=7, text="<b>done</b>", is_final=True)
+
+    assert len(fake.calls) == 1
+    assert bot._chat_state[7].last_msg_id is None
+
+@pytest.mark.asyncio
+async def test_final_edit_falls_back_to_plain_text(service):
+    svc, fake = service
+    state = bot._get_state(7)
+    state.last_msg_id = 55
+    state.last_msg_ts = asyncio.get_running_loop().time()
+    fake.edit_errors.append(BadRequest("Can't parse entities: unsupported start tag"))
+
+    await svc.send_or_edit(chat_id=7, text="<b>done</b>", is_final=True)
+
+    assert [(name, kw["parse_mode"]) for name, kw in fake.calls] == [("edit", "HTML"), ("edit", None)]
+    assert fake.calls[1][1]["message_id"] == 55
+
+@pytest.mark.asyncio
+async def test_prefer_edit_false_sends_new_message(service):
+    svc, fake = service
+    state = bot._get_state(7)
+    state.last_msg_id = 55
+    state.last_msg_ts = asyncio.get_running_loop().time()
+
+    await svc.send_or_edit(chat_id=7, text="part two", is_final=True, prefer_edit=False)
+
+    assert [name for name, _ in fake.calls] == ["send"]
+    assert bot._chat_state[7].last_msg_id == 101
+
+def text_update(text, edited=False):
+    message = types.SimpleNamespace(text=text)
+    return types.SimpleNamespace(
+        callback_query=None,
+        message=None if edited else message,
+        edited_message=message if edited else None,
+    )
+
+@pytest.mark.asyncio
+async def test_dispatch_routes_commands_for_this_bot_only(service):
+    svc, fake = service
+    fake.username = "MyBot"
+    handled = []
+
+    async def record(update, context):
+        handled.append(update.message.text)
+
+    svc._command_dispatch = {"/start": record}
+    svc.handle_message = record
+    for text in ["/start@OtherBot", "/start@mybot", "/start now", "/unknown", "hello"]:
+        await svc._dispatch(text_update(text), None)
+
+    assert handled == ["/start@mybot", "/start now", "hello"]
+
+@pytest.mark.asyncio
+async def test_dispatch_ignores_edited_messages(service):
+    svc, _ = service
+    handled = []
+
+    async def record(update, context):
+        handled.append(update)
+
+    svc.handle_message = record
+    await svc._dispatch(text_update("hello again", edited=True), None)
+
+    assert handled == []